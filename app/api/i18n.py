@@ -5,8 +5,11 @@ This module provides translation functionality for API responses
 based on the Accept-Language header.
 """
 
+import re
 from enum import Enum
-from typing import Dict, Optional
+from functools import lru_cache
+from string import Formatter
+from typing import Callable, Dict, Final, Optional, Tuple
 
 from fastapi import Request
 from loguru import logger
@@ -142,6 +145,38 @@ TRANSLATIONS: Dict[SupportedLanguage, Dict[str, str]] = {
 }
 
 
+_DEFAULT_LANG: Final = SupportedLanguage.get_default()
+
+# Language tag -> supported language; region subtags resolve through their primary subtag
+_TAG_MAP: Dict[str, SupportedLanguage] = {lang.value: lang for lang in SupportedLanguage}
+
+# One language range with its optional quality value, e.g. "en-US;q=0.8"
+_LANGUAGE_RANGE_RE = re.compile(r"\s*([A-Za-z*][A-Za-z0-9*-]*)\s*(;.*)?")
+_QUALITY_RE = re.compile(r";\s*q\s*=\s*([01](?:\.[0-9]{0,3})?)\s*(?=;|$)")
+
+
+@lru_cache(maxsize=1024)
+def _parse_accept_language(header: str) -> Tuple[str, ...]:
+    """
+    Parse an Accept-Language header into lowercased tags ordered by quality value.
+
+    Each comma-separated element is one language range; ranges with q=0 are not acceptable and
+    are dropped. Tags with equal quality keep their header order. Browsers send few distinct
+    headers, so results are cached per header string.
+    """
+    ranked = []
+    for element in header.split(","):
+        match = _LANGUAGE_RANGE_RE.fullmatch(element)
+        if match is None:
+            continue
+        tag, params = match.groups()
+        quality = _QUALITY_RE.search(params or "")
+        q = float(quality.group(1)) if quality else 1.0
+        if q > 0:
+            ranked.append((-q, tag.lower()))
+    return tuple(tag for _, tag in sorted(ranked, key=lambda item: item[0]))
+
+
 def get_preferred_language(request: Request) -> SupportedLanguage:
     """
     Extract the preferred language from the Accept-Language header.
@@ -156,26 +191,99 @@ def get_preferred_language(request: Request) -> SupportedLanguage:
 
     # Parse the Accept-Language header
     if accept_language:
-        # Split by comma and extract language codes
-        languages = [lang.split(";")[0].strip() for lang in accept_language.split(",")]
-
-        # Look for exact matches first
-        for lang in languages:
-            try:
-                return SupportedLanguage(lang)
-            except ValueError:
-                pass
-
-        # Look for partial matches (e.g., "en-US" should match "en")
-        for lang in languages:
-            base_lang = lang.split("-")[0]
-            try:
-                return SupportedLanguage(base_lang)
-            except ValueError:
-                pass
+        for tag in _parse_accept_language(accept_language):
+            lang = _TAG_MAP.get(tag) or _TAG_MAP.get(tag.partition("-")[0])
+            if lang is not None:
+                return lang
 
     # Default to English if no supported language is found
-    return SupportedLanguage.get_default()
+    return _DEFAULT_LANG
+
+
+def _compile(template: str) -> Optional[Callable[[Dict[str, str]], str]]:
+    """
+    Pre-split a template into (literal, field) segments so rendering skips format-string parsing.
+
+    Returns None for templates that use anything beyond plain named fields (positional or
+    attribute access, conversions, format specs); those keep going through str.format.
+    """
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError:
+        return None
+    if any(
+        name is not None and (spec or conversion or not name.isidentifier()) for _, name, spec, conversion in parsed
+    ):
+        return None
+    parts = tuple((literal, name) for literal, name, _, _ in parsed)
+
+    def render(placeholders: Dict[str, str]) -> str:
+        return "".join(literal if name is None else literal + str(placeholders[name]) for literal, name in parts)
+
+    return render
+
+
+# Renderers for every template with placeholders, keyed by the template text itself
+_COMPILED: Dict[str, Callable[[Dict[str, str]], str]] = {
+    template: render
+    for translations in TRANSLATIONS.values()
+    for template in translations.values()
+    if "{" in template and (render := _compile(template)) is not None
+}
+
+
+# One row per message key holding every language's template (English filled in for gaps),
+# indexed by _LANG_INDEX; a single dict probe replaces the per-language dict plus fallback
+_LANG_INDEX: Dict[SupportedLanguage, int] = {lang: index for index, lang in enumerate(SupportedLanguage)}
+_FLAT: Dict[str, Tuple[str, ...]] = {
+    key: tuple(
+        TRANSLATIONS.get(lang, {}).get(key, TRANSLATIONS[_DEFAULT_LANG].get(key, key)) for lang in SupportedLanguage
+    )
+    for translations in TRANSLATIONS.values()
+    for key in translations
+}
+_DEFAULT_INDEX: Final = _LANG_INDEX[_DEFAULT_LANG]
+
+
+def _resolve(message_key: str, lang: SupportedLanguage) -> str:
+    """Look up the raw template for a key, falling back to English and then to the key itself."""
+    row = _FLAT.get(message_key)
+    if row is None:
+        return message_key
+    return row[_LANG_INDEX.get(lang, _DEFAULT_INDEX)]
+
+
+def resolve_language(language: Optional[str]) -> Optional[SupportedLanguage]:
+    """
+    Map a language code to a supported language.
+
+    Args:
+        language: Language code such as "fr" or "en-US"
+
+    Returns:
+        The matching language, the default language if unsupported, or None if no code was given
+    """
+    if not language:
+        return None
+    return _TAG_MAP.get(language) or _TAG_MAP.get(language.partition("-")[0]) or _DEFAULT_LANG
+
+
+def get_message_template(message_key: str, language: Optional[SupportedLanguage] = None) -> str:
+    """
+    Get the message template for the given key and language, with placeholders left unfilled.
+
+    Args:
+        message_key: The key of the message template
+        language: Optional language code (defaults to English)
+
+    Returns:
+        The raw message template
+    """
+    return _resolve(message_key, language or _DEFAULT_LANG)
+
+
+# Shared read-only stand-in for calls without placeholders
+_NO_PLACEHOLDERS: Dict[str, str] = {}
 
 
 def get_translated_message(
@@ -194,20 +302,20 @@ def get_translated_message(
     Returns:
         The translated message
     """
-    lang = language or SupportedLanguage.get_default()
-    placeholders = placeholders or {}
+    template = _resolve(message_key, language or _DEFAULT_LANG)
 
-    # Get the translation dictionary for the language
-    translations = TRANSLATIONS.get(lang, TRANSLATIONS[SupportedLanguage.get_default()])
-
-    # Get the message template or fall back to the default language
-    template = translations.get(
-        message_key, TRANSLATIONS[SupportedLanguage.get_default()].get(message_key, message_key)
-    )
+    # Templates without placeholders need no formatting
+    if "{" not in template:
+        return template
 
-    # Format the message with placeholders
+    # Format the message with placeholders; format_map reads the dict in place instead of
+    # copying it into keyword arguments
+    values = placeholders or _NO_PLACEHOLDERS
     try:
-        return template.format(**placeholders)
+        render = _COMPILED.get(template)
+        if render is not None:
+            return render(values)
+        return template.format_map(values)
     except KeyError as e:
         logger.warning(f"Missing placeholder {e} in translation for {message_key}")
         return template
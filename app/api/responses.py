@@ -62,21 +62,18 @@ class ResponseMessage:
             Translated message
         """
         # Import here to avoid circular imports
-        from app.api.i18n import SupportedLanguage, get_translated_message
-
-        # Convert string language code to enum if provided
-        lang = None
-        if language:
-            try:
-                lang = SupportedLanguage(language)
-            except ValueError:
-                # Try to get the base language (e.g., "en-US" -> "en")
-                try:
-                    base_lang = language.split("-")[0]
-                    lang = SupportedLanguage(base_lang)
-                except (ValueError, IndexError):
-                    # Fall back to default language
-                    lang = SupportedLanguage.get_default()
+        from app.api.i18n import (
+            get_message_template,
+            get_translated_message,
+            resolve_language,
+        )
+
+        # Convert string language code to enum if provided (e.g., "en-US" -> "en")
+        lang = resolve_language(language)
+
+        # Without placeholders there is nothing to format; return the template as-is
+        if not self.placeholders:
+            return get_message_template(self.message_key, lang)
 
         # Get translated message
         return get_translated_message(message_key=self.message_key, placeholders=self.placeholders, language=lang)
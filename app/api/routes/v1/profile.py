@@ -1,6 +1,8 @@
 import logging
+import random
+import string
 from datetime import datetime, timedelta
-from typing import Any, List
+from typing import Any, Callable, List
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, status
@@ -140,17 +142,30 @@ async def update_password(
     return {"success": True, "message": "Password changed successfully"}
 
 
-async def create_verification_code(db: AsyncSession, user_id: str, verification_type: str) -> VerificationCode:
-    """Create a verification code."""
-    import random
-    import string
+def _new_id() -> str:
+    """Generate a new verification code id."""
+    return str(uuid4())
+
+
+def _random_code() -> str:
+    """Generate a random 6-digit verification code."""
+    return "".join(random.choices(string.digits, k=6))
 
-    # Generate a random 6-digit code
-    code = "".join(random.choices(string.digits, k=6))
+
+async def create_verification_code(
+    db: AsyncSession,
+    user_id: str,
+    verification_type: str,
+    *,
+    code_factory: Callable[[], str] = _random_code,
+    id_factory: Callable[[], str] = _new_id,
+) -> VerificationCode:
+    """Create a verification code."""
+    code = code_factory()
 
     # Set expiration time (1 hour)
     expires_at = datetime.utcnow() + timedelta(hours=1)
-    verification_id = str(uuid4())
+    verification_id = id_factory()
 
     # Create verification code
     db_verification_code = VerificationCode(
@@ -1,4 +1,4 @@
-from typing import Any, List
+from typing import Any, Callable, List
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -24,6 +24,16 @@ from app.utils.notifier import notify_user
 router = APIRouter()
 
 
+def _new_id() -> str:
+    """Generate a new transaction id."""
+    return str(uuid4())
+
+
+def get_id_factory() -> Callable[[], str]:
+    """Dependency providing the generator for new transaction ids."""
+    return _new_id
+
+
 @router.get("/balance", response_model=WalletSchema)
 async def get_balance(
     db: AsyncSession = Depends(get_db),
@@ -48,6 +58,7 @@ async def top_up_wallet(
     top_up_data: TopUpCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_verified_user),
+    id_factory: Callable[[], str] = Depends(get_id_factory),
 ) -> Any:
     """Top up wallet (simulated)."""
     query = select(Wallet).where(Wallet.user_id == current_user.id)
@@ -62,7 +73,7 @@ async def top_up_wallet(
 
     # Update wallet balance
     setattr(wallet, "balance", float(wallet.balance) + top_up_data.amount)
-    transaction_id = str(uuid4())
+    transaction_id = id_factory()
     # Create transaction record
     transaction = Transaction(
         id=transaction_id,
@@ -86,6 +97,7 @@ async def transfer_money(
     transaction_data: TransactionCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_verified_user),
+    id_factory: Callable[[], str] = Depends(get_id_factory),
 ) -> Any:
     """Transfer money to another user."""
     # Get sender's wallet
@@ -138,7 +150,7 @@ async def transfer_money(
     setattr(sender_wallet, "balance", float(sender_wallet.balance) - transaction_data.amount)
     setattr(recipient_wallet, "balance", float(recipient_wallet.balance) + transaction_data.amount)
 
-    transaction_id = str(uuid4())
+    transaction_id = id_factory()
     # Create transaction record
     transaction = Transaction(
         id=transaction_id,
@@ -189,6 +201,7 @@ async def withdraw_wallet(
     withdraw: TopUpCreate,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_verified_user),
+    id_factory: Callable[[], str] = Depends(get_id_factory),
 ) -> Any:
     """Withdraw (simulated)."""
     if withdraw.amount <= 0:
@@ -213,7 +226,7 @@ async def withdraw_wallet(
         )
     # Update wallet balance
     setattr(wallet, "balance", float(wallet.balance) - withdraw.amount)
-    transaction_id = str(uuid4())
+    transaction_id = id_factory()
     # Create transaction record
     transaction = Transaction(
         id=transaction_id,
@@ -3,7 +3,9 @@ API utility functions.
 """
 
 import re
-from typing import Any, Dict, Optional, Type, TypeVar, Union, cast
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar, Union, cast
+from weakref import WeakKeyDictionary
 
 import dns.resolver
 from fastapi import Response, status
@@ -102,74 +104,125 @@ def create_response(
             return Response(status_code=status_code, headers=headers)
 
     # If a response model is specified
-    if issubclass(response_model, DataResponseModel):
-        # Create a data response
-        response_data = response_model(  # type: ignore
-            code=ResponseCode.SUCCESS,
-            message=translated_message,
-            data=data,
-        )
-        return cast(Dict[str, Any], response_data)
-    elif issubclass(response_model, ErrorResponseModel):
-        # Create an error response
-        error_response = response_model(
-            detail=data,
-        )
-        return cast(Any, error_response)
-    else:
-        # Create a base response
-        base_response = response_model(  # type: ignore
-            code=ResponseCode.SUCCESS if status_code < 400 else ResponseCode.ERROR,
-            message=translated_message,
+    return _response_builder(response_model)(response_model, data, translated_message, status_code)
+
+
+def _build_data_response(response_model: Type[Any], data: Any, message: str, status_code: int) -> Dict[str, Any]:
+    # Create a data response
+    response_data = response_model(code=ResponseCode.SUCCESS, message=message, data=data)
+    return cast(Dict[str, Any], response_data)
+
+
+def _build_error_response(
+    response_model: Type[Any], data: Any, message: str, status_code: int
+) -> Union[Response, Dict[str, Any]]:
+    # Create an error response
+    return cast(Union[Response, Dict[str, Any]], response_model(detail=data))
+
+
+def _build_base_response(response_model: Type[Any], data: Any, message: str, status_code: int) -> Dict[str, Any]:
+    # Create a base response
+    base_response = response_model(
+        code=ResponseCode.SUCCESS if status_code < 400 else ResponseCode.ERROR,
+        message=message,
+    )
+    return cast(Dict[str, Any], base_response)
+
+
+_ResponseBuilder = Callable[[Type[Any], Any, str, int], Union[Response, Dict[str, Any]]]
+
+# Builders for the known response model families; subclasses resolve through their MRO
+_RESPONSE_BUILDERS: Dict[type, _ResponseBuilder] = {
+    DataResponseModel: _build_data_response,
+    ErrorResponseModel: _build_error_response,
+    BaseResponseModel: _build_base_response,
+}
+_RESOLVED_BUILDERS: "WeakKeyDictionary[type, _ResponseBuilder]" = WeakKeyDictionary()
+
+
+def _response_builder(response_model: type) -> _ResponseBuilder:
+    """Return the builder for a response model class, caching the MRO walk per class."""
+    builder = _RESOLVED_BUILDERS.get(response_model)
+    if builder is None:
+        builder = next(
+            (_RESPONSE_BUILDERS[cls] for cls in response_model.__mro__ if cls in _RESPONSE_BUILDERS),
+            _build_base_response,
         )
-        return cast(Dict[str, Any], base_response)
+        _RESOLVED_BUILDERS[response_model] = builder
+    return builder
 
 
 EMAIL_REGEX = re.compile(r"^[^@]+@([^@]+\.[^@]+)$")
 
 
+# domain -> (expires_at, has_mx); bounded, oldest entries are evicted first
+_MX_CACHE: Dict[str, Tuple[float, bool]] = {}
+_MX_CACHE_TTL_SECONDS = 3600
+_MX_CACHE_MAX_SIZE = 10_000
+
+
+def _mx_exists(domain: str) -> bool:
+    """Resolve MX records for a domain, caching definitive answers for an hour."""
+    domain = domain.lower()
+    now = time.monotonic()
+    cached = _MX_CACHE.get(domain)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    try:
+        answers = dns.resolver.resolve(domain, "MX")
+        has_mx = len(answers) > 0
+    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+        has_mx = False
+    except dns.exception.Timeout:
+        # Transient failure: reject this attempt but don't remember it
+        return False
+
+    _MX_CACHE.pop(domain, None)
+    if len(_MX_CACHE) >= _MX_CACHE_MAX_SIZE:
+        del _MX_CACHE[next(iter(_MX_CACHE))]
+    _MX_CACHE[domain] = (now + _MX_CACHE_TTL_SECONDS, has_mx)
+    return has_mx
+
+
 def is_valid_email_dns(email: str) -> bool:
     match = EMAIL_REGEX.match(email)
     if not match:
         return False
 
-    domain = match.group(1)
+    # Check for MX records
+    return _mx_exists(match.group(1))
 
-    try:
-        # Check for MX records
-        answers = dns.resolver.resolve(domain, "MX")
-        return len(answers) > 0
-    except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
-        return False
+
+# bytes.translate tables mapping ASCII digits to their value and to their Luhn-doubled value
+_NON_DIGIT_RE = re.compile(r"[^0-9]")
+_LUHN_VALUE = bytes.maketrans(b"0123456789", bytes(range(10)))
+_LUHN_DOUBLE = bytes.maketrans(b"0123456789", bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
 
 
 def luhn_checksum(card_number: str) -> bool:
     """Check if card number passes the Luhn algorithm."""
-    digits = [int(d) for d in card_number if d.isdigit()]
-    checksum = 0
+    digits = _NON_DIGIT_RE.sub("", card_number).encode("ascii")
+    # Every second digit from the right is doubled; both halves are summed without a per-digit loop
+    checksum = sum(digits[-1::-2].translate(_LUHN_VALUE)) + sum(digits[-2::-2].translate(_LUHN_DOUBLE))
+    return checksum % 10 == 0
 
-    for i, digit in enumerate(reversed(digits)):
-        if i % 2 == 1:
-            digit *= 2
-            if digit > 9:
-                digit -= 9
-        checksum += digit
 
-    return checksum % 10 == 0
+# IIN prefixes and lengths for each supported network, tried as a single alternation
+_CARD_TYPE_RE = re.compile(
+    r"^(?:(?P<visa>4[0-9]{12}(?:[0-9]{3})?)"
+    r"|(?P<mastercard>5[1-5][0-9]{14})"
+    r"|(?P<amex>3[47][0-9]{13})"
+    r"|(?P<discover>6(?:011|5[0-9]{2})[0-9]{12}))$"
+)
+_CARD_TYPE_NAMES = {"visa": "Visa", "mastercard": "MasterCard", "amex": "American Express", "discover": "Discover"}
 
 
 def get_card_type(card_number: str) -> str:
     """Return the type of card (Visa, MasterCard, etc.) based on IIN range."""
-    if re.match(r"^4[0-9]{12}(?:[0-9]{3})?$", card_number):
-        return "Visa"
-    elif re.match(r"^5[1-5][0-9]{14}$", card_number):
-        return "MasterCard"
-    elif re.match(r"^3[47][0-9]{13}$", card_number):
-        return "American Express"
-    elif re.match(r"^6(?:011|5[0-9]{2})[0-9]{12}$", card_number):
-        return "Discover"
-    else:
-        return "Unknown"
+    match = _CARD_TYPE_RE.match(card_number)
+    name = match.lastgroup if match else None
+    return _CARD_TYPE_NAMES[name] if name else "Unknown"
 
 
 def is_valid_card(card_number: str) -> CardValidation:
@@ -10,10 +10,17 @@ from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
 
-if "PYTEST_CURRENT_TEST" in os.environ:
-    DATABASE_URL = os.getenv("TEST_DATABASE_URL") or str(settings.DATABASE_URI)
-else:
-    DATABASE_URL = str(settings.DATABASE_URI)
+
+def get_database_url() -> str:
+    """
+    Get the database URL, preferring TEST_DATABASE_URL while running under pytest.
+    """
+    if "PYTEST_CURRENT_TEST" in os.environ:
+        return os.getenv("TEST_DATABASE_URL") or str(settings.DATABASE_URI)
+    return str(settings.DATABASE_URI)
+
+
+DATABASE_URL = get_database_url()
 
 # Create async engine
 engine = create_async_engine(
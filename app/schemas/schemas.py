@@ -308,13 +308,9 @@ class PaymentCardBase(BaseModel):
             if month_int < 1 or month_int > 12:
                 raise ValueError("Invalid month")
 
-            # Check if date is in the future (basic validation)
-            from datetime import datetime
-
-            current_year = datetime.now().year
-            current_month = datetime.now().month
-
-            if year_int < current_year or (year_int == current_year and month_int < current_month):
+            # Check if date is in the future (basic validation); read the clock once
+            now = datetime.now()
+            if (year_int, month_int) < (now.year, now.month):
                 raise ValueError("Card has expired")
 
         except ValueError as e:
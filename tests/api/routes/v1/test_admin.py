@@ -4,11 +4,10 @@ from uuid import UUID, uuid4
 
 import pytest
 from fastapi import HTTPException, status
-from fastapi.testclient import TestClient
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.main import app
+from app.api.dependencies import get_current_admin
+from app.db.session import get_db
 from app.schemas.schemas import (
     AdminPasswordUpdateRequest,
     AdminTransactionSummary,
@@ -20,12 +19,24 @@ from app.schemas.schemas import (
 class TestAdminRoutes:
 
     @pytest.fixture
-    def client(self):
-        return TestClient(app)
+    def mock_db(self):
+        return AsyncMock()
 
     @pytest.fixture
-    def mock_db(self):
-        return AsyncMock(spec=AsyncSession)
+    def override_admin_deps(self, override_dep):
+        mock_db = AsyncMock()
+        admin = MagicMock()
+
+        # async overrides run on the event loop instead of Starlette's threadpool
+        async def _db():
+            return mock_db
+
+        async def _admin():
+            return admin
+
+        override_dep(get_db, _db)
+        override_dep(get_current_admin, _admin)
+        return mock_db
 
     @pytest.fixture
     def mock_admin_user(self):
@@ -46,6 +57,20 @@ class TestAdminRoutes:
         user.hashed_password = "hashed_password"
         return user
 
+    @pytest.fixture
+    def db_returns_user(self, mock_db, mock_regular_user):
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = mock_regular_user
+        mock_db.execute.return_value = mock_result
+        return mock_result
+
+    @pytest.fixture
+    def db_returns_none(self, mock_db):
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db.execute.return_value = mock_result
+        return mock_result
+
     @pytest.fixture
     def sample_users(self):
         users = []
@@ -89,14 +114,12 @@ class TestAdminRoutes:
         assert exc_info.value.detail == "Database error"
 
     @pytest.mark.asyncio
-    async def test_toggle_user_active_success_activate(self, mock_db, mock_admin_user, mock_regular_user):
+    async def test_toggle_user_active_success_activate(
+        self, mock_db, mock_admin_user, mock_regular_user, db_returns_user
+    ):
         user_id = UUID(mock_regular_user.id)
         mock_regular_user.is_active = False
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_regular_user
-        mock_db.execute.return_value = mock_result
-
         from app.api.routes.v1.admin import toggle_user_active
 
         result = await toggle_user_active(user_id=user_id, db=mock_db, current_admin=mock_admin_user)
@@ -110,14 +133,12 @@ class TestAdminRoutes:
         mock_db.refresh.assert_called_once_with(mock_regular_user)
 
     @pytest.mark.asyncio
-    async def test_toggle_user_active_success_deactivate(self, mock_db, mock_admin_user, mock_regular_user):
+    async def test_toggle_user_active_success_deactivate(
+        self, mock_db, mock_admin_user, mock_regular_user, db_returns_user
+    ):
         user_id = UUID(mock_regular_user.id)
         mock_regular_user.is_active = True
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_regular_user
-        mock_db.execute.return_value = mock_result
-
         from app.api.routes.v1.admin import toggle_user_active
 
         result = await toggle_user_active(user_id=user_id, db=mock_db, current_admin=mock_admin_user)
@@ -129,13 +150,9 @@ class TestAdminRoutes:
         assert mock_regular_user.is_active is False
 
     @pytest.mark.asyncio
-    async def test_toggle_user_active_user_not_found(self, mock_db, mock_admin_user):
+    async def test_toggle_user_active_user_not_found(self, mock_db, mock_admin_user, db_returns_none):
         user_id = uuid4()
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
-
         from app.api.routes.v1.admin import toggle_user_active
 
         with pytest.raises(HTTPException) as exc_info:
@@ -159,14 +176,10 @@ class TestAdminRoutes:
         mock_db.rollback.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_update_user_password_success(self, mock_db, mock_admin_user, mock_regular_user):
+    async def test_update_user_password_success(self, mock_db, mock_admin_user, mock_regular_user, db_returns_user):
         user_id = UUID(mock_regular_user.id)
         payload = AdminPasswordUpdateRequest(new_password="new_secure_password")
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_regular_user
-        mock_db.execute.return_value = mock_result
-
         with patch("app.api.routes.v1.admin.get_password_hash", return_value="hashed_new_password") as mock_hash:
             from app.api.routes.v1.admin import update_user_password
 
@@ -196,13 +209,29 @@ class TestAdminRoutes:
         mock_db.rollback.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_get_admin_transaction_summary_success(self, mock_db, mock_admin_user):
-        mock_results = [
-            (5, 1000.0, 200.0),
-            (10, 2000.0, 200.0),
-            (8, 1600.0, 200.0),
-        ]
-
+    @pytest.mark.parametrize(
+        "mock_results, total_transactions, total_volume, trends, changes",
+        [
+            (
+                [(5, 1000.0, 200.0), (10, 2000.0, 200.0), (8, 1600.0, 200.0)],
+                23,
+                4600.0,
+                ["up", "stable", "stable"],
+                [100.0, 0.0, 0.0],
+            ),
+            (
+                [(5, 1000.0, 100.0), (10, 2000.0, 200.0), (8, 1200.0, 150.0)],
+                23,
+                4200.0,
+                ["up", "up", "down"],
+                [100.0, 100.0, -25.0],
+            ),
+        ],
+        ids=["flat_average", "trend_changes"],
+    )
+    async def test_get_admin_transaction_summary_success(
+        self, mock_db, mock_admin_user, mock_results, total_transactions, total_volume, trends, changes
+    ):
         mock_execute_result = MagicMock()
         mock_execute_result.one.side_effect = mock_results
         mock_db.execute.return_value = mock_execute_result
@@ -216,12 +245,11 @@ class TestAdminRoutes:
             result = await get_admin_transaction_summary(db=mock_db, current_admin=mock_admin_user)
 
             assert isinstance(result, AdminTransactionSummary)
-            assert result.overallStats.totalTransactions == 23
-            assert result.overallStats.totalVolume == 4600.0
-            assert len(result.monthlyStats) == 3
-            assert result.monthlyStats[0].month == "Jan"
-            assert result.monthlyStats[1].month == "Feb"
-            assert result.monthlyStats[2].month == "Mar"
+            assert result.overallStats.totalTransactions == total_transactions
+            assert result.overallStats.totalVolume == total_volume
+            assert [stat.month for stat in result.monthlyStats] == ["Jan", "Feb", "Mar"]
+            assert [stat.trend for stat in result.monthlyStats] == trends
+            assert [stat.changePercentage for stat in result.monthlyStats] == changes
 
     @pytest.mark.asyncio
     async def test_get_admin_transaction_summary_no_data(self, mock_db, mock_admin_user):
@@ -243,110 +271,58 @@ class TestAdminRoutes:
             assert result.overallStats.overallAverage == 0.0
 
     @pytest.mark.asyncio
-    async def test_get_balance_summary_no_data(self, mock_db, mock_admin_user):
+    async def test_get_balance_summary_no_data(self, mock_db, mock_admin_user, monkeypatch):
         mock_db.scalar.return_value = 0
 
         mock_execute_result = MagicMock()
         mock_execute_result.one.return_value = (0, None, None)
         mock_db.execute.return_value = mock_execute_result
 
+        monkeypatch.setattr("app.api.routes.v1.admin.calendar.monthrange", lambda *args, **kw: (0, 31))
+
         with patch("app.api.routes.v1.admin.datetime") as mock_datetime:
             mock_datetime.utcnow.return_value = datetime(2024, 1, 15)
             mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
 
-            with patch("app.api.routes.v1.admin.calendar.monthrange", return_value=(0, 31)):
-                from app.api.routes.v1.admin import get_balance_summary
+            from app.api.routes.v1.admin import get_balance_summary
 
-                result = await get_balance_summary(db=mock_db, current_admin=mock_admin_user)
+            result = await get_balance_summary(db=mock_db, current_admin=mock_admin_user)
 
-                assert isinstance(result, BalanceSummaryResponse)
-                assert len(result.monthlyStats) == 1
-                assert result.overallStats.totalUsers == 0
-                assert result.overallStats.currentTotalBalance == 0.0
+            assert isinstance(result, BalanceSummaryResponse)
+            assert len(result.monthlyStats) == 1
+            assert result.overallStats.totalUsers == 0
+            assert result.overallStats.currentTotalBalance == 0.0
 
-    def test_get_users_endpoint_integration(self, client):
-        with (
-            patch("app.api.routes.v1.admin.get_db") as mock_get_db,
-            patch("app.api.routes.v1.admin.get_current_admin") as mock_get_admin,
-        ):
-
-            mock_db = AsyncMock()
-            mock_admin = MagicMock()
-            mock_get_db.return_value = mock_db
-            mock_get_admin.return_value = mock_admin
-
-            mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = []
-            mock_db.execute.return_value = mock_result
+    def test_get_users_endpoint_integration(self, sync_client, override_admin_deps):
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        override_admin_deps.execute.return_value = mock_result
 
-            client.get("/api/v1/admin/users")
+        sync_client.get("/api/v1/admin/users")
 
-    def test_toggle_user_active_endpoint_integration(self, client):
+    def test_toggle_user_active_endpoint_integration(self, sync_client, override_admin_deps):
         user_id = str(uuid4())
 
-        with (
-            patch("app.api.routes.v1.admin.get_db") as mock_get_db,
-            patch("app.api.routes.v1.admin.get_current_admin") as mock_get_admin,
-        ):
-
-            mock_db = AsyncMock()
-            mock_admin = MagicMock()
-            mock_get_db.return_value = mock_db
-            mock_get_admin.return_value = mock_admin
-
-            client.patch(f"/api/v1/admin/admin/{user_id}/activate")
+        sync_client.patch(f"/api/v1/admin/admin/{user_id}/activate")
 
     @pytest.mark.asyncio
-    async def test_toggle_user_active_with_invalid_uuid(self, mock_db, mock_admin_user):
+    async def test_toggle_user_active_with_invalid_uuid(self, mock_db, mock_admin_user, db_returns_none):
         from app.api.routes.v1.admin import toggle_user_active
 
         valid_uuid = uuid4()
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute.return_value = mock_result
-
         with pytest.raises(HTTPException) as exc_info:
             await toggle_user_active(user_id=valid_uuid, db=mock_db, current_admin=mock_admin_user)
 
         assert exc_info.value.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_transaction_summary_trend_calculations(self, mock_db, mock_admin_user):
-        mock_results = [
-            (5, 1000.0, 100.0),
-            (10, 2000.0, 200.0),
-            (8, 1200.0, 150.0),
-        ]
-
-        mock_execute_result = MagicMock()
-        mock_execute_result.one.side_effect = mock_results
-        mock_db.execute.return_value = mock_execute_result
-
-        with patch("app.api.routes.v1.admin.datetime") as mock_datetime:
-            mock_datetime.utcnow.return_value = datetime(2024, 3, 15)
-            mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
-
-            from app.api.routes.v1.admin import get_admin_transaction_summary
-
-            result = await get_admin_transaction_summary(db=mock_db, current_admin=mock_admin_user)
-
-            assert result.monthlyStats[0].trend == "up"
-            assert result.monthlyStats[1].trend == "up"
-            assert result.monthlyStats[2].trend == "down"
-
-            assert result.monthlyStats[1].changePercentage == 100.0
-            assert result.monthlyStats[2].changePercentage == -25.0
-
-    @pytest.mark.asyncio
-    async def test_update_user_password_exception_handling(self, mock_db, mock_admin_user, mock_regular_user):
+    async def test_update_user_password_exception_handling(
+        self, mock_db, mock_admin_user, mock_regular_user, db_returns_user
+    ):
         user_id = UUID(mock_regular_user.id)
         payload = AdminPasswordUpdateRequest(new_password="new_password")
 
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_regular_user
-        mock_db.execute.return_value = mock_result
-
         mock_db.commit.side_effect = Exception("Commit failed")
 
         from app.api.routes.v1.admin import update_user_password
@@ -358,11 +334,6 @@ class TestAdminRoutes:
         mock_db.rollback.assert_called_once()
 
 
-@pytest.fixture(scope="session")
-def anyio_backend():
-    return "asyncio"
-
-
 class MockTransaction:
     def __init__(self, id, amount, created_at):
         self.id = id
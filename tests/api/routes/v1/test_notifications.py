@@ -8,8 +8,6 @@ from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException
-from sqlalchemy.engine import Result
-from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import the module under test
 from app.api.routes.v1.notifications import (
@@ -20,7 +18,25 @@ from app.api.routes.v1.notifications import (
 )
 
 # Mock models - adjust imports based on your actual structure
-from app.db.models.models import Notification, User
+from app.db.models.models import User
+from tests.mocks import FakeResult, FakeSession
+
+# One event loop for the whole session instead of a fresh loop per test.
+# Applied per class rather than module-wide so the sync tests don't pick it up.
+_session_loop = pytest.mark.asyncio(scope="session")
+
+_TS = datetime(2024, 1, 1, 12, 0, 0)
+_DATES = tuple(datetime(2024, 1, day, 12, 0, 0) for day in range(1, 32))
+
+
+class _NotifStub:
+    """Slotted notification stand-in for bulk lists."""
+
+    __slots__ = ("id", "title", "message", "type", "is_read", "created_at", "extra_data", "user_id")
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            setattr(self, name, value)
 
 
 class TestNotificationsAPI:
@@ -28,11 +44,10 @@ class TestNotificationsAPI:
 
     @pytest.fixture
     def mock_db(self):
-        """Mock database session."""
-        db = AsyncMock(spec=AsyncSession)
-        return db
+        """Fake database session."""
+        return FakeSession()
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_user(self):
         """Mock authenticated user."""
         user = Mock(spec=User)
@@ -40,16 +55,22 @@ class TestNotificationsAPI:
         user.email = "test@example.com"
         return user
 
+    @pytest.fixture
+    def expect_one_execute(self, mock_db):
+        """Assert at teardown that the handler issued exactly one query."""
+        yield
+        assert len(mock_db.executed) == 1
+
     @pytest.fixture
     def mock_notification(self):
         """Mock notification object."""
-        notification = Mock(spec=Notification)
+        notification = Mock()
         notification.id = "notif-123"
         notification.title = "Test Notification"
         notification.message = "This is a test notification"
         notification.type = "info"
         notification.is_read = False
-        notification.created_at = datetime(2024, 1, 1, 12, 0, 0)
+        notification.created_at = _TS
         notification.extra_data = {"key": "value"}
         notification.user_id = "user-123"
         return notification
@@ -57,44 +78,34 @@ class TestNotificationsAPI:
     @pytest.fixture
     def mock_notifications_list(self, mock_notification):
         """Mock list of notifications."""
-        notifications = []
-        for i in range(3):
-            notif = Mock(spec=Notification)
-            notif.id = f"notif-{i}"
-            notif.title = f"Test Notification {i}"
-            notif.message = f"This is test notification {i}"
-            notif.type = "info"
-            notif.is_read = i % 2 == 0  # Mix of read and unread
-            notif.created_at = datetime(2024, 1, i + 1, 12, 0, 0)
-            notif.extra_data = {"index": i}
-            notif.user_id = "user-123"
-            notifications.append(notif)
-        return notifications
-
-    @pytest.fixture
-    def mock_result(self):
-        """Mock SQLAlchemy result."""
-        result = Mock(spec=Result)
-        return result
-
-
+        return [
+            _NotifStub(
+                id=f"notif-{i}",
+                title=f"Test Notification {i}",
+                message=f"This is test notification {i}",
+                type="info",
+                is_read=i % 2 == 0,  # Mix of read and unread
+                created_at=_DATES[i],
+                extra_data={"index": i},
+                user_id="user-123",
+            )
+            for i in range(3)
+        ]
+
+
+@_session_loop
 class TestGetMyNotifications(TestNotificationsAPI):
     """Test the get_my_notifications endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_get_my_notifications_success(self, mock_db, mock_user, mock_notifications_list, mock_result):
+    @pytest.mark.usefixtures("expect_one_execute")
+    async def test_get_my_notifications_success(self, mock_db, mock_user, mock_notifications_list):
         """Test successful retrieval of user notifications."""
         # Setup mock result
-        mock_result.scalars.return_value.all.return_value = mock_notifications_list
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=mock_notifications_list))
 
         # Call the function
         result = await get_my_notifications(db=mock_db, current_user=mock_user)
 
-        # Verify database query
-        mock_db.execute.assert_called_once()
-        mock_db.execute.call_args[0][0]
-
         # Verify the result structure
         assert isinstance(result, list)
         assert len(result) == 3
@@ -117,12 +128,11 @@ class TestGetMyNotifications(TestNotificationsAPI):
         assert first_notif["read"] is True  # notif-0 should be read (i % 2 == 0)
         assert first_notif["extra_data"] == {"index": 0}
 
-    @pytest.mark.asyncio
-    async def test_get_my_notifications_empty_list(self, mock_db, mock_user, mock_result):
+    @pytest.mark.usefixtures("expect_one_execute")
+    async def test_get_my_notifications_empty_list(self, mock_db, mock_user):
         """Test retrieval when user has no notifications."""
         # Setup mock result with empty list
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult())
 
         # Call the function
         result = await get_my_notifications(db=mock_db, current_user=mock_user)
@@ -131,11 +141,10 @@ class TestGetMyNotifications(TestNotificationsAPI):
         assert isinstance(result, list)
         assert len(result) == 0
 
-    @pytest.mark.asyncio
     async def test_get_my_notifications_database_error(self, mock_db, mock_user):
         """Test handling of database errors."""
         # Setup mock to raise exception
-        mock_db.execute.side_effect = Exception("Database connection error")
+        mock_db.queue(Exception("Database connection error"))
 
         # Call the function and expect exception
         with pytest.raises(Exception) as exc_info:
@@ -143,36 +152,23 @@ class TestGetMyNotifications(TestNotificationsAPI):
 
         assert str(exc_info.value) == "Database connection error"
 
-    @pytest.mark.asyncio
-    async def test_get_my_notifications_user_id_filtering(self, mock_db, mock_user, mock_result):
-        """Test that notifications are filtered by user ID."""
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
-
-        await get_my_notifications(db=mock_db, current_user=mock_user)
-
-        # Verify that the query was called with user ID filtering
-        mock_db.execute.assert_called_once()
-        # The query should include user_id filtering - this is implicit in the SQLAlchemy query
-
 
+@_session_loop
 class TestMarkNotificationRead(TestNotificationsAPI):
     """Test the mark_notification_read endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_mark_notification_read_success(self, mock_db, mock_user, mock_notification, mock_result):
+    @pytest.mark.usefixtures("expect_one_execute")
+    async def test_mark_notification_read_success(self, mock_db, mock_user, mock_notification):
         """Test successfully marking a notification as read."""
         # Setup mock result
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_notification))
 
         # Call the function
         result = await mark_notification_read(notification_id="notif-123", db=mock_db, current_user=mock_user)
 
         # Verify database operations
-        mock_db.execute.assert_called_once()
-        mock_db.commit.assert_called_once()
-        mock_db.refresh.assert_called_once_with(mock_notification)
+        assert mock_db.commits == 1
+        assert mock_db.refreshed == [mock_notification]
 
         # Verify notification was marked as read
         assert mock_notification.is_read is True
@@ -183,44 +179,24 @@ class TestMarkNotificationRead(TestNotificationsAPI):
         assert result["id"] == "notif-123"
         assert result["read"] is True
 
-    @pytest.mark.asyncio
-    async def test_mark_notification_read_not_found(self, mock_db, mock_user, mock_result):
-        """Test marking non-existent notification as read."""
-        # Setup mock result with no notification found
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+    @pytest.mark.parametrize("notification_id", ["non-existent-id", "notif-123"], ids=["not_found", "wrong_user"])
+    async def test_mark_notification_read_not_found(self, mock_db, mock_user, notification_id):
+        """Test that missing notifications and other users' notifications both come back as 404."""
+        # The query filters on user_id, so both cases yield no row
+        mock_db.queue(FakeResult())
 
-        # Call the function and expect HTTPException
         with pytest.raises(HTTPException) as exc_info:
-            await mark_notification_read(notification_id="non-existent-id", db=mock_db, current_user=mock_user)
+            await mark_notification_read(notification_id=notification_id, db=mock_db, current_user=mock_user)
 
-        # Verify exception details
         assert exc_info.value.status_code == 404
         assert exc_info.value.detail == "Notification not found"
+        assert mock_db.commits == 0
 
-        # Verify no commit was called
-        mock_db.commit.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_mark_notification_read_wrong_user(self, mock_db, mock_user, mock_result):
-        """Test that user can only mark their own notifications as read."""
-        # This test verifies the query includes user_id filtering
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
-
-        with pytest.raises(HTTPException) as exc_info:
-            await mark_notification_read(notification_id="notif-123", db=mock_db, current_user=mock_user)
-
-        assert exc_info.value.status_code == 404
-        assert exc_info.value.detail == "Notification not found"
-
-    @pytest.mark.asyncio
-    async def test_mark_notification_read_database_error(self, mock_db, mock_user, mock_notification, mock_result):
+    async def test_mark_notification_read_database_error(self, mock_db, mock_user, mock_notification):
         """Test handling of database errors during mark as read."""
         # Setup mock result
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
-        mock_db.commit.side_effect = Exception("Database error")
+        mock_db.queue(FakeResult(first=mock_notification))
+        mock_db.commit = AsyncMock(side_effect=Exception("Database error"))
 
         # Call the function and expect exception
         with pytest.raises(Exception) as exc_info:
@@ -228,13 +204,11 @@ class TestMarkNotificationRead(TestNotificationsAPI):
 
         assert str(exc_info.value) == "Database error"
 
-    @pytest.mark.asyncio
-    async def test_mark_notification_read_already_read(self, mock_db, mock_user, mock_notification, mock_result):
+    async def test_mark_notification_read_already_read(self, mock_db, mock_user, mock_notification):
         """Test marking already read notification as read."""
         # Setup notification as already read
         mock_notification.is_read = True
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_notification))
 
         # Call the function
         result = await mark_notification_read(notification_id="notif-123", db=mock_db, current_user=mock_user)
@@ -244,31 +218,30 @@ class TestMarkNotificationRead(TestNotificationsAPI):
         assert result["read"] is True
 
 
+@_session_loop
 class TestMarkAllNotificationsRead(TestNotificationsAPI):
     """Test the mark_all_notifications_read endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_mark_all_notifications_read_success(self, mock_db, mock_user, mock_result):
+    @pytest.mark.usefixtures("expect_one_execute")
+    async def test_mark_all_notifications_read_success(self, mock_db, mock_user):
         """Test successfully marking all notifications as read."""
         # Create mock unread notifications
         unread_notifications = []
         for i in range(3):
-            notif = Mock(spec=Notification)
+            notif = Mock()
             notif.id = f"notif-{i}"
             notif.is_read = False
             notif.user_id = "user-123"
             unread_notifications.append(notif)
 
         # Setup mock result
-        mock_result.scalars.return_value.all.return_value = unread_notifications
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=unread_notifications))
 
         # Call the function
         result = await mark_all_notifications_read(db=mock_db, current_user=mock_user)
 
         # Verify database operations
-        mock_db.execute.assert_called_once()
-        mock_db.commit.assert_called_once()
+        assert mock_db.commits == 1
 
         # Verify all notifications were marked as read
         for notif in unread_notifications:
@@ -278,12 +251,10 @@ class TestMarkAllNotificationsRead(TestNotificationsAPI):
         assert isinstance(result, dict)
         assert result["message"] == "3 notification(s) marked as read"
 
-    @pytest.mark.asyncio
-    async def test_mark_all_notifications_read_no_unread(self, mock_db, mock_user, mock_result):
+    async def test_mark_all_notifications_read_no_unread(self, mock_db, mock_user):
         """Test marking all notifications as read when none are unread."""
         # Setup mock result with empty list
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult())
 
         # Call the function
         result = await mark_all_notifications_read(db=mock_db, current_user=mock_user)
@@ -291,17 +262,15 @@ class TestMarkAllNotificationsRead(TestNotificationsAPI):
         # Verify response
         assert result["message"] == "0 notification(s) marked as read"
 
-    @pytest.mark.asyncio
-    async def test_mark_all_notifications_read_single_notification(self, mock_db, mock_user, mock_result):
+    async def test_mark_all_notifications_read_single_notification(self, mock_db, mock_user):
         """Test marking all notifications as read with single notification."""
         # Create single unread notification
-        notif = Mock(spec=Notification)
+        notif = Mock()
         notif.id = "notif-1"
         notif.is_read = False
         notif.user_id = "user-123"
 
-        mock_result.scalars.return_value.all.return_value = [notif]
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=[notif]))
 
         # Call the function
         result = await mark_all_notifications_read(db=mock_db, current_user=mock_user)
@@ -312,10 +281,9 @@ class TestMarkAllNotificationsRead(TestNotificationsAPI):
         # Verify response
         assert result["message"] == "1 notification(s) marked as read"
 
-    @pytest.mark.asyncio
     async def test_mark_all_notifications_read_database_error(self, mock_db, mock_user):
         """Test handling of database errors during mark all as read."""
-        mock_db.execute.side_effect = Exception("Database connection error")
+        mock_db.queue(Exception("Database connection error"))
 
         with pytest.raises(Exception) as exc_info:
             await mark_all_notifications_read(db=mock_db, current_user=mock_user)
@@ -323,70 +291,47 @@ class TestMarkAllNotificationsRead(TestNotificationsAPI):
         assert str(exc_info.value) == "Database connection error"
 
 
+@_session_loop
 class TestDeleteNotification(TestNotificationsAPI):
     """Test the delete_notification endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_delete_notification_success(self, mock_db, mock_user, mock_notification, mock_result):
+    @pytest.mark.usefixtures("expect_one_execute")
+    async def test_delete_notification_success(self, mock_db, mock_user, mock_notification):
         """Test successfully deleting a notification."""
         # Setup mock result
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_notification))
 
         # Call the function
         result = await delete_notification(notification_id="notif-123", db=mock_db, current_user=mock_user)
 
         # Verify database operations
-        mock_db.execute.assert_called_once()
-        mock_db.delete.assert_called_once_with(mock_notification)
-        mock_db.commit.assert_called_once()
+        assert mock_db.deleted == [mock_notification]
+        assert mock_db.commits == 1
 
         # Verify response structure
         assert isinstance(result, dict)
         assert result["message"] == "Notification deleted successfully"
         assert result["id"] == "notif-123"
 
-    @pytest.mark.asyncio
-    async def test_delete_notification_not_found(self, mock_db, mock_user, mock_result):
-        """Test deleting non-existent notification."""
-        # Setup mock result with no notification found
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+    @pytest.mark.parametrize("notification_id", ["non-existent-id", "notif-123"], ids=["not_found", "wrong_user"])
+    async def test_delete_notification_not_found(self, mock_db, mock_user, notification_id):
+        """Test that deleting a missing or foreign notification is a 404 and touches nothing."""
+        # The query filters on user_id, so both cases yield no row
+        mock_db.queue(FakeResult())
 
-        # Call the function and expect HTTPException
         with pytest.raises(HTTPException) as exc_info:
-            await delete_notification(notification_id="non-existent-id", db=mock_db, current_user=mock_user)
+            await delete_notification(notification_id=notification_id, db=mock_db, current_user=mock_user)
 
-        # Verify exception details
         assert exc_info.value.status_code == 404
         assert exc_info.value.detail == "Notification not found"
+        assert mock_db.deleted == []
+        assert mock_db.commits == 0
 
-        # Verify no deletion was attempted
-        mock_db.delete.assert_not_called()
-        mock_db.commit.assert_not_called()
-
-    @pytest.mark.asyncio
-    async def test_delete_notification_wrong_user(self, mock_db, mock_user, mock_result):
-        """Test that user can only delete their own notifications."""
-        # This test verifies the query includes user_id filtering
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
-
-        with pytest.raises(HTTPException) as exc_info:
-            await delete_notification(notification_id="notif-123", db=mock_db, current_user=mock_user)
-
-        assert exc_info.value.status_code == 404
-        assert exc_info.value.detail == "Notification not found"
-
-    @pytest.mark.asyncio
-    async def test_delete_notification_database_error_on_delete(
-        self, mock_db, mock_user, mock_notification, mock_result
-    ):
+    async def test_delete_notification_database_error_on_delete(self, mock_db, mock_user, mock_notification):
         """Test handling of database errors during deletion."""
         # Setup mock result
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
-        mock_db.delete.side_effect = Exception("Database deletion error")
+        mock_db.queue(FakeResult(first=mock_notification))
+        mock_db.delete = AsyncMock(side_effect=Exception("Database deletion error"))
 
         # Call the function and expect exception
         with pytest.raises(Exception) as exc_info:
@@ -394,15 +339,11 @@ class TestDeleteNotification(TestNotificationsAPI):
 
         assert str(exc_info.value) == "Database deletion error"
 
-    @pytest.mark.asyncio
-    async def test_delete_notification_database_error_on_commit(
-        self, mock_db, mock_user, mock_notification, mock_result
-    ):
+    async def test_delete_notification_database_error_on_commit(self, mock_db, mock_user, mock_notification):
         """Test handling of database errors during commit."""
         # Setup mock result
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
-        mock_db.commit.side_effect = Exception("Commit error")
+        mock_db.queue(FakeResult(first=mock_notification))
+        mock_db.commit = AsyncMock(side_effect=Exception("Commit error"))
 
         # Call the function and expect exception
         with pytest.raises(Exception) as exc_info:
@@ -411,15 +352,14 @@ class TestDeleteNotification(TestNotificationsAPI):
         assert str(exc_info.value) == "Commit error"
 
 
+@_session_loop
 class TestEdgeCases(TestNotificationsAPI):
     """Test edge cases and boundary conditions."""
 
-    @pytest.mark.asyncio
-    async def test_notification_id_validation(self, mock_db, mock_user, mock_result):
+    async def test_notification_id_validation(self, mock_db, mock_user):
         """Test notification ID validation with various formats."""
-        # Test with empty string
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+        # Test with empty string, then a UUID
+        mock_db.queue(FakeResult(), FakeResult())
 
         with pytest.raises(HTTPException):
             await mark_notification_read("", mock_db, mock_user)
@@ -429,24 +369,26 @@ class TestEdgeCases(TestNotificationsAPI):
         with pytest.raises(HTTPException):  # Will fail because notification doesn't exist
             await mark_notification_read(valid_uuid, mock_db, mock_user)
 
-    @pytest.mark.asyncio
-    async def test_large_notification_list(self, mock_db, mock_user, mock_result):
+    async def test_large_notification_list(self, mock_db, mock_user):
         """Test handling of large notification lists."""
         # Create a large list of notifications
-        large_notification_list = []
-        for i in range(1000):
-            notif = Mock(spec=Notification)
-            notif.id = f"notif-{i}"
-            notif.title = f"Notification {i}"
-            notif.message = f"Message {i}"
-            notif.type = "info"
-            notif.is_read = False
-            notif.created_at = datetime(2024, 1, 1, 12, 0, 0)
-            notif.extra_data = {}
-            large_notification_list.append(notif)
-
-        mock_result.scalars.return_value.all.return_value = large_notification_list
-        mock_db.execute.return_value = mock_result
+        large_notification_list = [
+            _NotifStub(
+                id="notif-" + n,
+                title="Notification " + n,
+                message="Message " + n,
+                type="info",
+                is_read=False,
+                created_at=_TS,
+                extra_data={},
+                user_id="user-123",
+            )
+            for n in map(str, range(1000))
+        ]
+
+        # One query for each handler below
+        large_result = FakeResult(all=large_notification_list)
+        mock_db.queue(large_result, large_result)
 
         # Test get_my_notifications with large list
         result = await get_my_notifications(db=mock_db, current_user=mock_user)
@@ -456,44 +398,40 @@ class TestEdgeCases(TestNotificationsAPI):
         result = await mark_all_notifications_read(db=mock_db, current_user=mock_user)
         assert result["message"] == "1000 notification(s) marked as read"
 
-    @pytest.mark.asyncio
-    async def test_notification_with_null_extra_data(self, mock_db, mock_user, mock_result):
+    async def test_notification_with_null_extra_data(self, mock_db, mock_user):
         """Test handling of notifications with null extra_data."""
         # Create notification with None extra_data
-        notif = Mock(spec=Notification)
+        notif = Mock()
         notif.id = "notif-1"
         notif.title = "Test"
         notif.message = "Test message"
         notif.type = "info"
         notif.is_read = False
-        notif.created_at = datetime(2024, 1, 1, 12, 0, 0)
+        notif.created_at = _TS
         notif.extra_data = None
         notif.user_id = "user-123"
 
-        mock_result.scalars.return_value.all.return_value = [notif]
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=[notif]))
 
         result = await get_my_notifications(db=mock_db, current_user=mock_user)
 
         assert len(result) == 1
         assert result[0]["extra_data"] is None
 
-    @pytest.mark.asyncio
-    async def test_notification_with_special_characters(self, mock_db, mock_user, mock_result):
+    async def test_notification_with_special_characters(self, mock_db, mock_user):
         """Test handling of notifications with special characters."""
         # Create notification with special characters
-        notif = Mock(spec=Notification)
+        notif = Mock()
         notif.id = "notif-1"
         notif.title = "Test with �mojis =� and special chars: <>&\"'"
         notif.message = "Message with unicode: K�-�"
         notif.type = "info"
         notif.is_read = False
-        notif.created_at = datetime(2024, 1, 1, 12, 0, 0)
+        notif.created_at = _TS
         notif.extra_data = {"unicode": "K�", "symbols": "!@#$%^&*()"}
         notif.user_id = "user-123"
 
-        mock_result.scalars.return_value.all.return_value = [notif]
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=[notif]))
 
         result = await get_my_notifications(db=mock_db, current_user=mock_user)
 
@@ -502,16 +440,15 @@ class TestEdgeCases(TestNotificationsAPI):
         assert "K�-�" in result[0]["message"]
 
 
+@_session_loop
 class TestIntegrationScenarios(TestNotificationsAPI):
     """Integration tests for common notification scenarios."""
 
-    @pytest.mark.asyncio
-    async def test_notification_lifecycle(self, mock_db, mock_user, mock_notification, mock_result):
+    async def test_notification_lifecycle(self, mock_db, mock_user, mock_notification):
         """Test complete notification lifecycle: create, read, delete."""
         # Mock notification starts unread
         mock_notification.is_read = False
-        mock_result.scalars.return_value.first.return_value = mock_notification
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_notification), FakeResult(first=mock_notification))
 
         # 1. Mark as read
         read_result = await mark_notification_read("notif-123", mock_db, mock_user)
@@ -522,39 +459,14 @@ class TestIntegrationScenarios(TestNotificationsAPI):
         delete_result = await delete_notification("notif-123", mock_db, mock_user)
         assert delete_result["message"] == "Notification deleted successfully"
 
-    @pytest.mark.asyncio
-    async def test_concurrent_notification_operations(self, mock_db, mock_user, mock_result):
-        """Test handling of concurrent notification operations."""
-        # Create multiple notifications
-        notifications = []
-        for i in range(5):
-            notif = Mock(spec=Notification)
-            notif.id = f"notif-{i}"
-            notif.is_read = False
-            notif.user_id = "user-123"
-            notifications.append(notif)
-
-        mock_result.scalars.return_value.all.return_value = notifications
-        mock_db.execute.return_value = mock_result
-
-        # Mark all as read
-        result = await mark_all_notifications_read(db=mock_db, current_user=mock_user)
-
-        # Verify all were marked as read
-        for notif in notifications:
-            assert notif.is_read is True
-
-        assert result["message"] == "5 notification(s) marked as read"
-
 
 class TestResponseModels(TestNotificationsAPI):
     """Test response model structures and validation."""
 
-    @pytest.mark.asyncio
-    async def test_get_notifications_response_structure(self, mock_db, mock_user, mock_notification, mock_result):
+    @_session_loop
+    async def test_get_notifications_response_structure(self, mock_db, mock_user, mock_notification):
         """Test that get_notifications returns proper structure."""
-        mock_result.scalars.return_value.all.return_value = [mock_notification]
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=[mock_notification]))
 
         result = await get_my_notifications(db=mock_db, current_user=mock_user)
 
@@ -606,25 +518,19 @@ class TestResponseModels(TestNotificationsAPI):
 
 
 # Performance and stress tests
+@_session_loop
 class TestPerformance(TestNotificationsAPI):
     """Performance-related tests."""
 
-    @pytest.mark.asyncio
-    async def test_query_efficiency(self, mock_db, mock_user, mock_result):
-        """Test that queries are called efficiently."""
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
-
-        # Test that get_my_notifications makes only one query
-        await get_my_notifications(db=mock_db, current_user=mock_user)
-        assert mock_db.execute.call_count == 1
-
-        # Reset mock
-        mock_db.reset_mock()
+    @pytest.mark.usefixtures("expect_one_execute")
+    @pytest.mark.parametrize(
+        "handler", [get_my_notifications, mark_all_notifications_read], ids=["get_my", "mark_all_read"]
+    )
+    async def test_query_efficiency(self, mock_db, mock_user, handler):
+        """Test that each list handler issues a single query."""
+        mock_db.queue(FakeResult())
 
-        # Test that mark_all_notifications_read makes only one query
-        await mark_all_notifications_read(db=mock_db, current_user=mock_user)
-        assert mock_db.execute.call_count == 1
+        await handler(db=mock_db, current_user=mock_user)
 
 
 if __name__ == "__main__":
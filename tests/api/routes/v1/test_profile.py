@@ -4,7 +4,7 @@ Place this file in: tests/api/routes/v1/
 """
 
 from datetime import datetime
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import Mock, patch
 
 import pytest
 from fastapi.responses import JSONResponse
@@ -16,6 +16,18 @@ from app.api.routes.v1.profile import (
     get_monthly_transaction_summary,
     update_phone,
 )
+from tests.mocks import FakeResult, FakeSession
+
+
+def _frozen_datetime(*args):
+    """Real datetime subclass whose now() is pinned, so attribute access stays on the C type."""
+
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(*args, tzinfo=tz)
+
+    return _FrozenDatetime
 
 
 # Simple mock classes
@@ -44,7 +56,7 @@ class TestProfileSimple:
 
     @pytest.fixture
     def mock_db(self):
-        return AsyncMock()
+        return FakeSession()
 
     @pytest.fixture
     def mock_user(self):
@@ -75,9 +87,7 @@ class TestProfileSimple:
         phone_data = MockPhoneRequest(phone="+1987654321")
 
         # Mock no existing user with same phone
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=None))
 
         with patch("app.api.routes.v1.profile.create_verification_code") as mock_create_code:
             mock_create_code.return_value = Mock()
@@ -92,7 +102,7 @@ class TestProfileSimple:
             assert mock_user.phone == "+1987654321"
 
             # Verify database operations
-            mock_db.commit.assert_called_once()
+            assert mock_db.commits == 1
             mock_create_code.assert_called_once()
 
     @pytest.mark.asyncio
@@ -103,9 +113,7 @@ class TestProfileSimple:
         # Mock existing user with same phone
         existing_user = MockUser()
         existing_user.id = "other-user"
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = existing_user
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=existing_user))
 
         result = await update_phone(phone_data=phone_data, db=mock_db, current_user=mock_user)
 
@@ -117,32 +125,26 @@ class TestProfileSimple:
     @pytest.mark.asyncio
     async def test_create_verification_code_basic(self, mock_db):
         """Test basic verification code creation."""
-        with (
-            patch("random.choices", return_value=["1", "2", "3", "4", "5", "6"]),
-            patch("uuid.uuid4") as mock_uuid,
-            patch("builtins.print"),
-        ):  # Mock the print statement
-
-            mock_uuid.return_value.__str__ = Mock(return_value="verification-123")
-
-            await create_verification_code(mock_db, "user-123", "phone")
-
-            # Verify database operations
-            mock_db.add.assert_called_once()
-            mock_db.commit.assert_called_once()
-            mock_db.refresh.assert_called_once()
+        await create_verification_code(
+            mock_db, "user-123", "phone", code_factory=lambda: "123456", id_factory=lambda: "verification-123"
+        )
+
+        # Verify database operations
+        assert len(mock_db.added) == 1
+        verification = mock_db.added[0]
+        assert verification.id == "verification-123"
+        assert verification.code == "123456"
+        assert mock_db.commits == 1
+        assert len(mock_db.refreshed) == 1
 
     # Test monthly summary basic functionality
     @pytest.mark.asyncio
     async def test_get_monthly_summary_basic(self, mock_db, mock_user):
         """Test basic monthly summary retrieval."""
         # Mock empty database result
-        mock_result = Mock()
-        mock_result.all.return_value = []
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=[]))
 
-        with patch("app.api.routes.v1.profile.datetime") as mock_datetime:
-            mock_datetime.now.return_value = datetime(2024, 3, 15)  # March
+        with patch("app.api.routes.v1.profile.datetime", _frozen_datetime(2024, 3, 15)):  # March
 
             result = await get_monthly_transaction_summary(db=mock_db, current_user=mock_user)
 
@@ -162,12 +164,9 @@ class TestProfileSimple:
         mock_row.received = 500.0
         mock_row.sent = 200.0
 
-        mock_result = Mock()
-        mock_result.all.return_value = [mock_row]
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=[mock_row]))
 
-        with patch("app.api.routes.v1.profile.datetime") as mock_datetime:
-            mock_datetime.now.return_value = datetime(2024, 2, 15)  # February
+        with patch("app.api.routes.v1.profile.datetime", _frozen_datetime(2024, 2, 15)):  # February
 
             result = await get_monthly_transaction_summary(db=mock_db, current_user=mock_user)
 
@@ -192,7 +191,7 @@ class TestPhoneVerificationLogic:
 
     @pytest.fixture
     def mock_db(self):
-        return AsyncMock()
+        return FakeSession()
 
     @pytest.mark.asyncio
     async def test_phone_verified_user_becomes_unverified(self, mock_db):
@@ -204,9 +203,7 @@ class TestPhoneVerificationLogic:
 
         phone_data = MockPhoneRequest(phone="+1987654321")
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=None))
 
         with patch("app.api.routes.v1.profile.create_verification_code"):
             result = await update_phone(phone_data=phone_data, db=mock_db, current_user=user)
@@ -225,9 +222,7 @@ class TestPhoneVerificationLogic:
 
         phone_data = MockPhoneRequest(phone="+1987654321")
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=None))
 
         with patch("app.api.routes.v1.profile.create_verification_code"):
             result = await update_phone(phone_data=phone_data, db=mock_db, current_user=user)
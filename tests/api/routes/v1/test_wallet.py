@@ -3,8 +3,10 @@ Simplified test file for wallet API endpoints.
 Place this file in: tests/api/routes/v1/
 """
 
+from dataclasses import dataclass
 from decimal import Decimal
-from unittest.mock import AsyncMock, Mock, patch
+from typing import Any
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi import HTTPException
@@ -17,6 +19,7 @@ from app.api.routes.v1.wallet import (
     transfer_money,
     withdraw_wallet,
 )
+from tests.mocks import FakeResult, FakeSession
 
 
 # Simple mock classes to avoid Pydantic validation issues
@@ -33,30 +36,33 @@ class MockTransactionData:
         self.description = description
 
 
+@dataclass(slots=True)
 class MockUser:
-    def __init__(self, user_id="user-123"):
-        self.id = user_id
-        self.email = "test@example.com"
-        self.fullname = "Test User"
+    id: str = "user-123"
+    email: str = "test@example.com"
+    fullname: str = "Test User"
 
 
+@dataclass(slots=True)
 class MockWallet:
-    def __init__(self, user_id="user-123", balance=1000.0):
-        self.id = "wallet-123"
-        self.user_id = user_id
-        self.balance = Decimal(str(balance))
+    user_id: str = "user-123"
+    balance: Decimal = Decimal("1000.0")
+    id: str = "wallet-123"
 
+    def __post_init__(self):
+        self.balance = Decimal(str(self.balance))
 
+
+@dataclass(slots=True)
 class MockTransaction:
-    def __init__(self, **kwargs):
-        self.id = kwargs.get("id", "txn-123")
-        self.sender_id = kwargs.get("sender_id", "user-123")
-        self.recipient_id = kwargs.get("recipient_id", "user-456")
-        self.amount = kwargs.get("amount", Decimal("100.00"))
-        self.type = kwargs.get("type", "transfer")
-        self.status = kwargs.get("status", "completed")
-        self.sender = kwargs.get("sender", None)
-        self.recipient = kwargs.get("recipient", None)
+    id: str = "txn-123"
+    sender_id: str = "user-123"
+    recipient_id: str = "user-456"
+    amount: Decimal = Decimal("100.00")
+    type: str = "transfer"
+    status: str = "completed"
+    sender: Any = None
+    recipient: Any = None
 
 
 class TestWalletSimple:
@@ -64,7 +70,7 @@ class TestWalletSimple:
 
     @pytest.fixture
     def mock_db(self):
-        return AsyncMock()
+        return FakeSession()
 
     @pytest.fixture
     def mock_user(self):
@@ -77,27 +83,46 @@ class TestWalletSimple:
     @pytest.mark.asyncio
     async def test_get_balance_success(self, mock_db, mock_user, mock_wallet):
         """Test successful balance retrieval."""
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = mock_wallet
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_wallet))
 
         result = await get_balance(db=mock_db, current_user=mock_user)
 
         assert result == mock_wallet
-        mock_db.execute.assert_called_once()
+        assert len(mock_db.executed) == 1
 
     @pytest.mark.asyncio
-    async def test_get_balance_wallet_not_found(self, mock_db, mock_user):
-        """Test balance retrieval when wallet doesn't exist."""
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+    @pytest.mark.parametrize(
+        "call, detail",
+        [
+            (lambda db, user: get_balance(db=db, current_user=user), "Wallet not found"),
+            (
+                lambda db, user: top_up_wallet(
+                    top_up_data=MockTopUpData(amount=500.0, card_id="card-123"), db=db, current_user=user
+                ),
+                "Wallet not found",
+            ),
+            (
+                lambda db, user: transfer_money(
+                    transaction_data=MockTransactionData(
+                        recipient_identifier="recipient@example.com", amount=200.0, description="Test transfer"
+                    ),
+                    db=db,
+                    current_user=user,
+                ),
+                "Sender wallet not found",
+            ),
+        ],
+        ids=["get_balance", "top_up", "transfer"],
+    )
+    async def test_wallet_not_found(self, mock_db, mock_user, call, detail):
+        """Test that handlers return 404 when the user's wallet doesn't exist."""
+        mock_db.queue(FakeResult(first=None))
 
         with pytest.raises(HTTPException) as exc_info:
-            await get_balance(db=mock_db, current_user=mock_user)
+            await call(mock_db, mock_user)
 
         assert exc_info.value.status_code == 404
-        assert exc_info.value.detail == "Wallet not found"
+        assert exc_info.value.detail == detail
 
     @pytest.mark.asyncio
     async def test_top_up_wallet_success(self, mock_db, mock_user, mock_wallet):
@@ -105,39 +130,22 @@ class TestWalletSimple:
         top_up_data = MockTopUpData(amount=500.0, card_id="card-123")
         initial_balance = float(mock_wallet.balance)
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = mock_wallet
-        mock_db.execute.return_value = mock_result
-
-        with patch("uuid.uuid4") as mock_uuid:
-            mock_uuid.return_value.__str__ = Mock(return_value="transaction-123")
-
-            result = await top_up_wallet(top_up_data=top_up_data, db=mock_db, current_user=mock_user)
-
-            # Verify wallet balance was updated
-            assert mock_wallet.balance == initial_balance + top_up_data.amount
-
-            # Verify database operations
-            mock_db.add.assert_called_once()
-            mock_db.commit.assert_called_once()
-            mock_db.refresh.assert_called_once()
-
-            assert result == mock_wallet
+        mock_db.queue(FakeResult(first=mock_wallet))
 
-    @pytest.mark.asyncio
-    async def test_top_up_wallet_not_found(self, mock_db, mock_user):
-        """Test top up when wallet doesn't exist."""
-        top_up_data = MockTopUpData(amount=500.0, card_id="card-123")
+        result = await top_up_wallet(
+            top_up_data=top_up_data, db=mock_db, current_user=mock_user, id_factory=lambda: "transaction-123"
+        )
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
+        # Verify wallet balance was updated
+        assert mock_wallet.balance == initial_balance + top_up_data.amount
 
-        with pytest.raises(HTTPException) as exc_info:
-            await top_up_wallet(top_up_data=top_up_data, db=mock_db, current_user=mock_user)
+        # Verify database operations
+        assert len(mock_db.added) == 1
+        assert mock_db.added[0].id == "transaction-123"
+        assert mock_db.commits == 1
+        assert len(mock_db.refreshed) == 1
 
-        assert exc_info.value.status_code == 404
-        assert exc_info.value.detail == "Wallet not found"
+        assert result == mock_wallet
 
     @pytest.mark.asyncio
     async def test_withdraw_wallet_success(self, mock_db, mock_user, mock_wallet):
@@ -145,22 +153,22 @@ class TestWalletSimple:
         withdraw_data = MockTopUpData(amount=300.0, card_id="card-123")
         initial_balance = float(mock_wallet.balance)
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = mock_wallet
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_wallet))
 
-        with patch("uuid.uuid4"):
-            result = await withdraw_wallet(withdraw=withdraw_data, db=mock_db, current_user=mock_user)
+        result = await withdraw_wallet(
+            withdraw=withdraw_data, db=mock_db, current_user=mock_user, id_factory=lambda: "transaction-456"
+        )
 
-            # Verify wallet balance was updated
-            assert mock_wallet.balance == initial_balance - withdraw_data.amount
+        # Verify wallet balance was updated
+        assert mock_wallet.balance == initial_balance - withdraw_data.amount
 
-            # Verify database operations
-            mock_db.add.assert_called_once()
-            mock_db.commit.assert_called_once()
-            mock_db.refresh.assert_called_once()
+        # Verify database operations
+        assert len(mock_db.added) == 1
+        assert mock_db.added[0].id == "transaction-456"
+        assert mock_db.commits == 1
+        assert len(mock_db.refreshed) == 1
 
-            assert result == mock_wallet
+        assert result == mock_wallet
 
     @pytest.mark.asyncio
     async def test_withdraw_wallet_negative_amount(self, mock_db, mock_user):
@@ -179,9 +187,7 @@ class TestWalletSimple:
         withdraw_data = MockTopUpData(amount=1500.0, card_id="card-123")
         mock_wallet = MockWallet(balance=1000.0)  # Less than withdrawal amount
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = mock_wallet
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=mock_wallet))
 
         with pytest.raises(HTTPException) as exc_info:
             await withdraw_wallet(withdraw=withdraw_data, db=mock_db, current_user=mock_user)
@@ -199,9 +205,7 @@ class TestWalletSimple:
         )
 
         sender_wallet = MockWallet(balance=1000.0)
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = sender_wallet
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(first=sender_wallet))
 
         with pytest.raises(HTTPException) as exc_info:
             await transfer_money(transaction_data=transaction_data, db=mock_db, current_user=mock_user)
@@ -210,21 +214,36 @@ class TestWalletSimple:
         assert exc_info.value.detail == "Insufficient balance"
 
     @pytest.mark.asyncio
-    async def test_transfer_money_sender_wallet_not_found(self, mock_db, mock_user):
-        """Test transfer when sender wallet doesn't exist."""
+    async def test_transfer_money_success(self, mock_db, mock_user):
+        """Test successful transfer between two wallets."""
         transaction_data = MockTransactionData(
             recipient_identifier="recipient@example.com", amount=200.0, description="Test transfer"
         )
-
-        mock_result = Mock()
-        mock_result.scalars.return_value.first.return_value = None
-        mock_db.execute.return_value = mock_result
-
-        with pytest.raises(HTTPException) as exc_info:
-            await transfer_money(transaction_data=transaction_data, db=mock_db, current_user=mock_user)
-
-        assert exc_info.value.status_code == 404
-        assert exc_info.value.detail == "Sender wallet not found"
+        recipient = MockUser(id="user-456", email="recipient@example.com", fullname="Recipient")
+        sender_wallet = MockWallet(balance=1000.0)
+        recipient_wallet = MockWallet(user_id="user-456", balance=50.0, id="wallet-456")
+
+        mock_db.queue(FakeResult(first=sender_wallet), FakeResult(first=recipient_wallet))
+
+        with patch.multiple(
+            "app.api.routes.v1.wallet",
+            get_user_by_email=AsyncMock(return_value=recipient),
+            notify_user=AsyncMock(),
+        ) as mocks:
+            result = await transfer_money(
+                transaction_data=transaction_data,
+                db=mock_db,
+                current_user=mock_user,
+                id_factory=lambda: "transaction-789",
+            )
+
+        assert sender_wallet.balance == 800.0
+        assert recipient_wallet.balance == 250.0
+        assert mock_db.added == [result]
+        assert result.id == "transaction-789"
+        assert result.recipient_id == "user-456"
+        assert mock_db.commits == 1
+        assert mocks["notify_user"].await_count == 2
 
     @pytest.mark.asyncio
     async def test_get_transactions_success(self, mock_db, mock_user):
@@ -234,13 +253,11 @@ class TestWalletSimple:
             MockTransaction(id="txn-2", amount=Decimal("200.00")),
         ]
 
-        mock_result = Mock()
-        mock_result.scalars.return_value.all.return_value = transactions
-        mock_db.execute.return_value = mock_result
+        mock_db.queue(FakeResult(all=transactions))
 
         result = await get_transactions(limit=50, offset=0, db=mock_db, current_user=mock_user)
 
         assert isinstance(result, list)
         assert len(result) == 2
         assert result == transactions
-        mock_db.execute.assert_called_once()
+        assert len(mock_db.executed) == 1
@@ -5,9 +5,12 @@ from fastapi import Request
 from app.api.i18n import (
     TRANSLATIONS,
     SupportedLanguage,
+    _parse_accept_language,
     get_preferred_language,
     get_translated_message,
+    resolve_language,
 )
+from app.api.responses import ResponseMessage
 
 
 class TestSupportedLanguage:
@@ -71,6 +74,12 @@ class TestGetPreferredLanguage:
         result = get_preferred_language(request)
         assert result == SupportedLanguage.GERMAN
 
+    def test_get_preferred_language_regional_tag_keeps_header_order(self):
+        """Test that a regional tag listed first beats a later exact match."""
+        request = self.create_mock_request("en-GB,fr")
+        result = get_preferred_language(request)
+        assert result == SupportedLanguage.ENGLISH
+
     def test_get_preferred_language_no_header(self):
         """Test when no Accept-Language header is present."""
         request = Mock(spec=Request)
@@ -102,6 +111,37 @@ class TestGetPreferredLanguage:
         result = get_preferred_language(request)
         assert result == SupportedLanguage.ENGLISH
 
+    def test_get_preferred_language_orders_by_quality(self):
+        """Test that higher quality values win regardless of header order."""
+        request = self.create_mock_request("fr;q=0.5, de;q=0.8, es")
+        result = get_preferred_language(request)
+        assert result == SupportedLanguage.SPANISH
+
+    def test_get_preferred_language_skips_q_zero(self):
+        """Test that ranges with q=0 are treated as not acceptable."""
+        request = self.create_mock_request("zh, fr;q=0")
+        result = get_preferred_language(request)
+        assert result == SupportedLanguage.ENGLISH
+
+    def test_parse_accept_language_ignores_extra_parameters(self):
+        """Test that non-q parameters are not parsed as language tags."""
+        assert _parse_accept_language("en;level=1, fr;q=0.5;x=y") == ("en", "fr")
+
+
+def test_resolve_language():
+    """Test mapping raw language codes to supported languages."""
+    assert resolve_language("fr") == SupportedLanguage.FRENCH
+    assert resolve_language("de-AT") == SupportedLanguage.GERMAN
+    assert resolve_language("zh") == SupportedLanguage.ENGLISH
+    assert resolve_language(None) is None
+
+
+def test_response_message_translate_uses_placeholders_set_after_init():
+    """Test that placeholders added after construction are still applied."""
+    message = ResponseMessage("RecordCreated")
+    message.placeholders["record"] = "card"
+    assert message.translate("en") == "The card was successfully created."
+
 
 class TestGetTranslatedMessage:
     """Test cases for get_translated_message function."""
@@ -1,3 +1,4 @@
+import dns.resolver
 import pytest
 from fastapi import Response
 
@@ -27,6 +28,14 @@ def patch_get_request_language(monkeypatch):
     monkeypatch.setattr("app.api.utils.get_request_language", lambda: MockLanguage())
 
 
+@pytest.fixture(autouse=True)
+def clear_mx_cache():
+    # is_valid_email_dns caches MX lookups per domain at module level.
+    utils._MX_CACHE.clear()
+    yield
+    utils._MX_CACHE.clear()
+
+
 @pytest.fixture(autouse=True)
 def patch_response_message(monkeypatch):
     class MockResponseMessage:
@@ -125,16 +134,29 @@ def test_is_valid_email_dns_valid(monkeypatch):
     assert utils.is_valid_email_dns("test@example.com") is True
 
 
+def test_is_valid_email_dns_caches_mx_lookup(monkeypatch):
+    calls = []
+
+    def mock_resolve(domain, record_type):
+        calls.append(domain)
+        return [object()]
+
+    monkeypatch.setattr("dns.resolver.resolve", mock_resolve)
+    assert utils.is_valid_email_dns("a@cached.example") is True
+    assert utils.is_valid_email_dns("b@Cached.Example") is True
+    assert calls == ["cached.example"]
+
+
 def test_is_valid_email_dns_invalid_format():
     assert utils.is_valid_email_dns("invalid-email") is False
 
 
-# def test_is_valid_email_dns_invalid_dns(monkeypatch):
-#     def mock_resolve(domain, record_type):
-#         raise dns.resolver.NoAnswer()
+def test_is_valid_email_dns_invalid_dns(monkeypatch):
+    def mock_resolve(domain, record_type):
+        raise dns.resolver.NoAnswer()
 
-#     monkeypatch.setattr("dns.resolver.resolve", mock_resolve)
-#     assert utils.is_valid_email_dns("test@noanswer.com") is False
+    monkeypatch.setattr("dns.resolver.resolve", mock_resolve)
+    assert utils.is_valid_email_dns("test@noanswer.com") is False
 
 
 # --- Card Validation ---
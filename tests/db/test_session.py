@@ -1,28 +1,23 @@
+from contextlib import aclosing
+
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import session
 
 
 def test_database_url_env(monkeypatch):
     monkeypatch.setenv("TEST_DATABASE_URL", "postgresql+asyncpg://test/test")
-    # Reload module to pick up env var
-    import importlib
-
-    import app.db.session as session_mod
-
-    importlib.reload(session_mod)
-    assert "test" in session_mod.engine.url.database
+    # Resolve the URL directly; reloading the module would build a second engine and a new Base
+    assert session.get_database_url() == "postgresql+asyncpg://test/test"
 
 
 @pytest.mark.asyncio
 async def test_get_db_yields_session():
-    async_gen = session.get_db()
-    session_obj = await async_gen.__anext__()
-    from sqlalchemy.ext.asyncio import AsyncSession
+    # aclosing guarantees the generator's finally (session.close) runs even if an assertion fails
+    async with aclosing(session.get_db()) as async_gen:
+        session_obj = await async_gen.__anext__()
+        assert isinstance(session_obj, AsyncSession)
 
-    assert isinstance(session_obj, AsyncSession)
-    # Clean up generator
-    try:
-        await async_gen.__anext__()
-    except StopAsyncIteration:
-        pass
+        with pytest.raises(StopAsyncIteration):
+            await async_gen.__anext__()
@@ -0,0 +1,68 @@
+"""Hand-rolled AsyncSession doubles for route handler tests."""
+
+from collections import deque
+from typing import Any, Iterable, List, Union
+
+
+class FakeResult:
+    """Query result exposing ``first()``/``all()`` directly and through ``scalars()``.
+
+    ``scalar_one_or_none()`` returns the same value as ``first()``.
+    """
+
+    __slots__ = ("_first", "_all")
+
+    def __init__(self, first: Any = None, all: Iterable[Any] = ()) -> None:
+        self._first = first
+        self._all = all
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+    def first(self) -> Any:
+        return self._first
+
+    def all(self) -> List[Any]:
+        return list(self._all)
+
+    def scalar_one_or_none(self) -> Any:
+        return self._first
+
+
+class FakeSession:
+    """AsyncSession stand-in that replays queued results and records what the handler did."""
+
+    def __init__(self) -> None:
+        self.executed: List[Any] = []
+        self.added: List[Any] = []
+        self.refreshed: List[Any] = []
+        self.deleted: List[Any] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self._results: deque = deque()
+
+    def queue(self, *results: Union[FakeResult, BaseException]) -> None:
+        """Queue results returned by the next ``execute()`` calls, in order; exceptions are raised instead."""
+        self._results.extend(results)
+
+    async def execute(self, statement: Any) -> FakeResult:
+        self.executed.append(statement)
+        result = self._results.popleft()
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def add(self, obj: Any) -> None:
+        self.added.append(obj)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def refresh(self, obj: Any) -> None:
+        self.refreshed.append(obj)
+
+    async def delete(self, obj: Any) -> None:
+        self.deleted.append(obj)
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
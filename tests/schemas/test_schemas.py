@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
@@ -6,6 +6,11 @@ from pydantic import ValidationError
 
 from app.schemas import schemas
 
+# Fixed dates keep card-expiry tests independent of the wall clock (and of month/year boundaries).
+_FUTURE_EXPIRY = "12/99"
+_PAST_EXPIRY = "01/20"
+_TIMESTAMP = datetime(2024, 1, 1, 12, 0, 0)
+
 
 def test_user_base_email_and_phone_validation():
     # Valid: only email
@@ -44,7 +49,7 @@ def test_payment_card_base_valid():
     card = schemas.PaymentCardBase(
         name="  My Visa  ",
         cardNumber="4111 1111 1111 1111",
-        expireDate=(datetime.now() + timedelta(days=60)).strftime("%m/%y"),
+        expireDate=_FUTURE_EXPIRY,
         cvc="123",
     )
     assert card.name == "My Visa"
@@ -53,7 +58,7 @@ def test_payment_card_base_valid():
 
 
 def test_payment_card_base_invalid_expired():
-    expired = (datetime.now() - timedelta(days=30)).strftime("%m/%y")
+    expired = _PAST_EXPIRY
     with pytest.raises(ValidationError) as exc:
         schemas.PaymentCardBase(name="Test", cardNumber="4111111111111111", expireDate=expired, cvc="123")
     assert "Card has expired" in str(exc.value)
@@ -84,8 +89,8 @@ def test_user_in_db_base_orm_mode():
         fullname="Test User",
         id=uuid4(),
         email="test@example.com",
-        created_at=datetime.now(),
-        updated_at=datetime.now(),
+        created_at=_TIMESTAMP,
+        updated_at=_TIMESTAMP,
         is_active=True,
         is_admin=False,
         is_verified=True,